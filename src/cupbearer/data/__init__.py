@@ -1,5 +1,5 @@
 # ruff: noqa: F401
-from ._shared import MixedData, TransformDataset
+from ._shared import MixedData, TransformCollate, TransformDataset
 from .adversarial import AdversarialExampleDataset, make_adversarial_examples
 from .backdoors import (
     Backdoor,
@@ -9,7 +9,7 @@ from .backdoors import (
     WanetBackdoor,
 )
 from .huggingface import HuggingfaceDataset, IMDBDataset
-from .pytorch import CIFAR10, GTSRB, MNIST, PytorchDataset
+from .pytorch import CIFAR10, GTSRB, MNIST, PreloadedMNIST, PytorchDataset
 from .toy_ambiguous_features import ToyDataset
 from .transforms import (
     GaussianNoise,
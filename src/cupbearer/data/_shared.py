@@ -1,6 +1,6 @@
-from typing import Optional
+from typing import Callable, Optional
 
-from torch.utils.data import Dataset
+from torch.utils.data import Dataset, default_collate
 
 from cupbearer.data.transforms import Transform
 
@@ -20,6 +20,34 @@ class TransformDataset(Dataset):
         return self.transform(sample)
 
 
+class TransformCollate:
+    """Collate function that applies a transform to entire batches.
+
+    Transforms that support batched inputs (such as `CornerPixelBackdoor`,
+    `NoiseBackdoor` or `GaussianNoise`) can be applied once per batch this way,
+    instead of once per sample inside the dataset. This is opt-in: `BackdoorDataset`
+    and the loaders inside `cupbearer` still apply transforms per sample. To use it,
+    pass the transform here instead of wrapping the dataset, e.g.
+    ```
+    DataLoader(clean_data, batch_size=64, collate_fn=TransformCollate(backdoor))
+    ```
+
+    `WanetBackdoor` doesn't support batched inputs and will raise an error if used
+    with this.
+    """
+
+    def __init__(self, transform: Transform, collate_fn: Callable = default_collate):
+        self.transform = transform
+        self.collate_fn = collate_fn
+
+    def __call__(self, batch):
+        batch = self.collate_fn(batch)
+        if isinstance(batch, list):
+            # default_collate turns tuples into lists, but transforms expect tuples
+            batch = tuple(batch)
+        return self.transform(batch)
+
+
 class MixedData(Dataset):
     def __init__(
         self,
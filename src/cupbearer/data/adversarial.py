@@ -1,12 +1,12 @@
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
 
 import torch
 import torchattacks
 from loguru import logger
 from matplotlib import pyplot as plt
-from torch.utils.data import DataLoader, Dataset, Subset
+from torch.utils.data import DataLoader, Dataset, Subset, default_collate
 
 from cupbearer import utils
 
@@ -18,7 +18,9 @@ class AdversarialExampleDataset(Dataset):
 
     @classmethod
     def from_file(cls, filepath: Path, num_examples=None):
-        data = utils.load(filepath)
+        # Memory-map the examples, we often only need a few of them and this way
+        # we don't have to load the entire file.
+        data = utils.load(filepath, mmap=True)
         assert isinstance(data, dict)
         advexes = data["adv_inputs"]
         labels = data["labels"]
@@ -43,7 +45,86 @@ class AdversarialExampleDataset(Dataset):
         # TODO: Probably detectors should just never have access to labels during evals
         # (none of the current ones make use of them anyway). If a detector needs them,
         # it should use the model-generated labels, not ground truth ones.
-        return self.advexes[idx], int(self.labels[idx])
+        advex = self.advexes[idx]
+        if advex.dtype == torch.uint8:
+            # Stored as 8-bit images, see make_adversarial_examples
+            return advex.float() / 255, int(self.labels[idx])
+        # Copy so that callers can't modify the (possibly memory-mapped) storage
+        return advex.to(torch.float32, copy=True), int(self.labels[idx])
+
+
+def _quantize(
+    adv_inputs: torch.Tensor, inputs: torch.Tensor, eps: float
+) -> torch.Tensor:
+    """Quantize adversarial examples in [0, 1] to uint8, staying in the eps-ball.
+
+    If the clean inputs aren't on the 1/255 grid themselves (e.g. after resizing),
+    plain rounding could move pixels outside of [inputs - eps, inputs + eps], so we
+    clamp to the grid points inside that interval. (If eps is smaller than the grid
+    spacing, there might not be any, in which case we use the one just above.)
+    """
+    # PGD already clips to [0, 1], and the attack output is a fresh tensor, so we
+    # can scale it in place. The small tolerance keeps floating point errors from
+    # excluding grid points that lie exactly on the boundary of the eps-ball.
+    quantized = adv_inputs.mul_(255).round_()
+    lower = ((inputs - eps) * 255 - 1e-4).ceil_().clamp_(min=0)
+    upper = ((inputs + eps) * 255 + 1e-4).floor_().clamp_(max=255)
+    return torch.max(torch.min(quantized, upper), lower).to(torch.uint8)
+
+
+def _attack(
+    atk: torchattacks.attack.Attack,
+    batches: Iterable[tuple[torch.Tensor, torch.Tensor]],
+    num_examples: int,
+) -> tuple[torch.Tensor, torch.Tensor, float]:
+    """Run `atk` on all `batches` of inputs and labels.
+
+    This replaces `atk.save`, which re-concatenates all adversarial examples so far and
+    writes them to disk again after every single batch. (Note that torchattacks
+    itself still syncs with the device for every batch, e.g. to check the input
+    range, so there's no point in trying to avoid syncs here.)
+
+    Returns:
+        The adversarial inputs (quantized to uint8), the original labels, and the
+        model's accuracy on the adversarial inputs (in percent, for consistency with
+        torchattacks).
+    """
+    adv_inputs = labels = None
+    num_done = 0
+    correct = 0
+
+    for inputs, batch_labels in batches:
+        # We store adversarial examples as 8-bit images, which makes them 4x smaller.
+        # The accuracy is computed on the quantized examples, so that it reflects
+        # what we actually save.
+        batch_adv_inputs = _quantize(
+            atk(inputs, batch_labels), inputs.to(atk.device), atk.eps
+        )
+        # The attack itself might run under bfloat16 autocast (see low_precision in
+        # make_adversarial_examples), but the accuracy should be measured in full
+        # precision.
+        with torch.autocast(device_type=batch_adv_inputs.device.type, enabled=False):
+            logits = atk.get_output_with_eval_nograd(batch_adv_inputs.float().div_(255))
+        correct += (logits.argmax(dim=1) == batch_labels.to(atk.device)).sum().item()
+
+        if adv_inputs is None or labels is None:
+            # Write results into buffers for the entire dataset instead of
+            # concatenating all batches at the end, which would need an extra copy.
+            adv_inputs = torch.empty(
+                (num_examples, *batch_adv_inputs.shape[1:]), dtype=torch.uint8
+            )
+            labels = torch.empty(num_examples, dtype=torch.long)
+
+        batch_size = len(batch_labels)
+        adv_inputs[num_done : num_done + batch_size] = batch_adv_inputs
+        labels[num_done : num_done + batch_size] = batch_labels
+        num_done += batch_size
+
+    assert adv_inputs is not None and labels is not None, "No data to attack"
+    assert num_done == num_examples, (num_done, num_examples)
+
+    rob_acc = 100 * correct / num_examples
+    return adv_inputs, labels, rob_acc
 
 
 def make_adversarial_examples(
@@ -55,6 +136,14 @@ def make_adversarial_examples(
     max_examples: Optional[int] = None,
     success_threshold: float = 0.1,
     steps: int = 40,
+    # If True, move the entire dataset to the model's device once and iterate over
+    # slices of it instead of using a DataLoader. Much faster for small datasets
+    # like MNIST.
+    preload_to_device: bool = False,
+    num_workers: int = 0,
+    # If True, run the model in bfloat16 during the attack. Only the sign of the
+    # gradient matters for the attack, so this rarely makes a difference.
+    low_precision: bool = False,
 ) -> AdversarialExampleDataset:
     save_path = Path(save_path).with_suffix(".pt")
     if os.path.exists(save_path):
@@ -63,38 +152,78 @@ def make_adversarial_examples(
 
     if max_examples:
         dataset = Subset(dataset, range(max_examples))
-    dataloader = DataLoader(
-        dataset,
-        batch_size=batch_size,
-        shuffle=False,
-    )
+
+    device = next(model.parameters()).device
+    if preload_to_device:
+        inputs, labels = default_collate(
+            [dataset[i] for i in range(len(dataset))]  # type: ignore
+        )
+        inputs, labels = inputs.to(device), labels.to(device)
+        batches = zip(inputs.split(batch_size), labels.split(batch_size))
+    else:
+        batches = DataLoader(
+            dataset,
+            batch_size=batch_size,
+            shuffle=False,
+            pin_memory=device.type == "cuda",
+            num_workers=num_workers,
+        )
+
+    attack_model = model
+    # We don't use DataParallel with low_precision: its replica threads re-enter
+    # autocast without passing on the dtype, so they'd silently run in float16
+    # instead of bfloat16.
+    if device.type == "cuda" and torch.cuda.device_count() > 1 and not low_precision:
+        # The attack is independent for each input, so we can just split every batch
+        # across all GPUs. DataParallel needs the model's device to come first.
+        device_ids = [device.index] + [
+            i for i in range(torch.cuda.device_count()) if i != device.index
+        ]
+        attack_model = torch.nn.DataParallel(model, device_ids=device_ids)
 
     atk = torchattacks.PGD(
-        model, eps=eps, alpha=2 / 255, steps=steps, random_start=True
+        attack_model, eps=eps, alpha=2 / 255, steps=steps, random_start=True
     )
-    rob_acc, l2, elapsed_time = atk.save(dataloader, save_path, return_verbose=True)
+    # Every batch (except maybe the last one) has the same shape and we run many
+    # attack steps on each, so it's worth letting cuDNN benchmark and cache the
+    # fastest convolution algorithms for these shapes.
+    # A smaller last batch costs one more (cheap) benchmark. We deliberately don't
+    # pad it to the full batch size, since running every attack step on the padding
+    # would cost more than that.
+    cudnn_benchmark = torch.backends.cudnn.benchmark
+    torch.backends.cudnn.benchmark = True
+    try:
+        with torch.autocast(
+            device_type=device.type, dtype=torch.bfloat16, enabled=low_precision
+        ):
+            adv_inputs, labels, rob_acc = _attack(
+                atk, batches, num_examples=len(dataset)  # type: ignore
+            )
+    finally:
+        torch.backends.cudnn.benchmark = cudnn_benchmark
 
     # N.B. rob_acc is in percent while success_threshold is not
     if rob_acc > 100 * success_threshold:
-        # Make sure we delete the unsuccessful data so we don't load it later
-        save_path.unlink()
+        # We haven't saved anything yet, so unsuccessful data won't be loaded later
         raise RuntimeError(
             "Attack failed, new accuracy is"
             f" {rob_acc}% > {100 * success_threshold}%."
         )
 
+    utils.save({"adv_inputs": adv_inputs, "labels": labels}, save_path)
+
     # Plot a few adversarial examples in a grid and save the plot as a pdf
-    adv_examples = torch.load(save_path)["adv_inputs"]
     fig, axs = plt.subplots(3, 3, figsize=(8, 8))
     for i in range(9):
         ax = axs[i // 3, i % 3]
         ax.set_xticks([])
         ax.set_yticks([])
         try:
-            ax.imshow(adv_examples[i].permute(1, 2, 0))
+            ax.imshow(adv_inputs[i].permute(1, 2, 0))
         except IndexError:
             pass
     plt.tight_layout()
     plt.savefig(save_path.with_suffix(".pdf"))
 
-    return AdversarialExampleDataset.from_file(save_path)
+    # No need to load the examples we just saved back from disk
+    return AdversarialExampleDataset(adv_inputs, labels)
@@ -27,6 +27,9 @@ class Backdoor(Transform, ABC):
         raise NotImplementedError()
 
     def __call__(self, sample: Tuple[torch.Tensor, int]) -> Tuple[torch.Tensor, int]:
+        if sample[0].ndim == 4:
+            return self._batch_call(*sample)
+
         if torch.rand(1) > self.p_backdoor:
             # Backdoor inactive, don't do anything
             return sample
@@ -37,6 +40,23 @@ class Backdoor(Transform, ABC):
         img = img.clone()
         return self.inject_backdoor(img), self.target_class
 
+    def _batch_call(
+        self, imgs: torch.Tensor, labels: torch.Tensor
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        # Vectorized version of __call__ for collated batches (e.g. when used with
+        # TransformCollate): decide for all samples at once whether to apply the
+        # backdoor, then inject it into all selected images in one go.
+        mask = torch.rand(len(imgs), device=imgs.device) <= self.p_backdoor
+        if not mask.any():
+            return imgs, labels
+
+        # Do changes out of place
+        imgs = imgs.clone()
+        labels = torch.as_tensor(labels).clone()
+        imgs[mask] = self.inject_backdoor(imgs[mask])
+        labels[mask] = self.target_class
+        return imgs, labels
+
 
 class BackdoorDataset(TransformDataset):
     """Just a wrapper around TransformDataset with aliases and more specific types."""
@@ -68,15 +88,16 @@ class CornerPixelBackdoor(Backdoor):
         ], "Invalid corner specified"
 
     def inject_backdoor(self, img: torch.Tensor):
-        assert img.ndim == 3
+        # Either a single image or a batch of images
+        assert img.ndim in (3, 4)
         if self.corner == "top-left":
-            img[:, 0, 0] = 1
+            img[..., 0, 0] = 1
         elif self.corner == "top-right":
-            img[:, -1, 0] = 1
+            img[..., -1, 0] = 1
         elif self.corner == "bottom-left":
-            img[:, 0, -1] = 1
+            img[..., 0, -1] = 1
         elif self.corner == "bottom-right":
-            img[:, -1, -1] = 1
+            img[..., -1, -1] = 1
 
         return img
 
@@ -87,8 +108,9 @@ class NoiseBackdoor(Backdoor):
 
     def inject_backdoor(self, img: torch.Tensor):
         assert torch.all(img <= 1), "Image not in range [0, 1]"
-        noise = torch.normal(0, self.std, img.shape)
-        img += noise
+        # randn_like (unlike torch.normal) also creates the noise on the right device
+        # when backdooring batches that already live on the GPU.
+        img.add_(torch.randn_like(img), alpha=self.std)
         img.clip_(0, 1)
 
         return img
@@ -1,5 +1,6 @@
 from dataclasses import dataclass, field
 
+import torch
 from loguru import logger
 from torch.utils.data import Dataset
 
@@ -69,10 +70,35 @@ class PytorchDataset(Dataset):
         return dataset
 
 
+class PreloadedMNIST(Dataset):
+    """MNIST with all images converted to a single float tensor up front.
+
+    torchvision's MNIST turns every sample into a PIL image in `__getitem__`, which
+    `ToTensor` then has to convert back. MNIST is small enough that it's much cheaper
+    to do that conversion once for the entire dataset, after which indexing is just
+    a view into one contiguous tensor.
+    """
+
+    def __init__(self, dataset):
+        # dataset.data is a uint8 tensor of shape (N, 28, 28). Dividing by 255 is
+        # exactly what ToTensor does for PIL images, we just add the channel dimension.
+        self.images = (dataset.data.float() / 255).unsqueeze(1).contiguous()
+        self.targets = dataset.targets.long()
+
+    def __len__(self):
+        return len(self.images)
+
+    def __getitem__(self, index) -> tuple[torch.Tensor, int]:
+        return self.images[index], int(self.targets[index])
+
+
 @dataclass
 class MNIST(PytorchDataset):
     name: str = "torchvision.datasets.MNIST"
     num_classes: int = 10
+    # If True, convert the whole dataset to a tensor once instead of going through
+    # PIL for every sample.
+    preload: bool = True
 
     @property
     def raw_mean(self):
@@ -82,6 +108,21 @@ class MNIST(PytorchDataset):
     def raw_std(self):
         return (0.3081,)
 
+    def __post_init__(self):
+        if self.preload:
+            # Preloaded images are tensors already, so ToTensor would just be an
+            # extra no-op call for every sample.
+            self.transforms = [
+                t for t in self.transforms if not isinstance(t, ToTensor)
+            ]
+        super().__post_init__()
+
+    def _build(self) -> Dataset:
+        dataset = super()._build()
+        if self.preload:
+            return PreloadedMNIST(dataset)
+        return dataset
+
 
 @dataclass
 class CIFAR10(PytorchDataset):
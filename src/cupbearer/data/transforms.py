@@ -46,8 +46,12 @@ class AdaptedTransform(Transform, ABC):
 
 
 class ToTensor(AdaptedTransform):
-    def __img_call__(self, img: PILImage | ndarray) -> torch.Tensor:
-        out = F.to_tensor(img)
+    def __img_call__(self, img: ImageLike) -> torch.Tensor:
+        if isinstance(img, torch.Tensor):
+            # Already converted, e.g. by a preloaded dataset
+            out = img
+        else:
+            out = F.to_tensor(img)
         if out.ndim == 2:
             # Add a channel dimension. (Using pytorch's CHW convention)
             out = out.unsqueeze(0)
@@ -158,7 +162,8 @@ class RandomHorizontalFlip(ProbabilisticTransform):
 class GaussianNoise(AdaptedTransform):
     """Adds Gaussian noise to the image.
 
-    Note that this expects to_tensor to have been applied already.
+    Note that this expects to_tensor to have been applied already. Works on single
+    images as well as batches, so it can also be used with `TransformCollate`.
 
     Args:
         std: Standard deviation of the Gaussian noise.
@@ -167,4 +172,6 @@ class GaussianNoise(AdaptedTransform):
     std: float
 
     def __img_call__(self, img: torch.Tensor) -> torch.Tensor:
-        return img + self.std * torch.randn_like(img)
+        # Reuse the noise buffer for the output instead of allocating two temporaries
+        noise = torch.randn_like(img)
+        return noise.mul_(self.std).add_(img)
@@ -113,6 +113,7 @@ class AbstractionDetector(ActivationBasedDetector):
         *,
         lr: float = 1e-3,
         batch_size: int = 64,
+        num_workers: int = 0,
         **trainer_kwargs,
     ):
         if trusted_data is None:
@@ -127,7 +128,10 @@ class AbstractionDetector(ActivationBasedDetector):
         )
 
         train_loader = torch.utils.data.DataLoader(
-            trusted_data, batch_size=batch_size, shuffle=True
+            trusted_data,
+            batch_size=batch_size,
+            shuffle=True,
+            num_workers=num_workers,
         )
 
         # TODO: implement validation data
@@ -220,12 +220,20 @@ class CacheBuilder(ActivationBasedDetector):
         assert self.cache is not None
         self.cache.store(self.cache_path)
 
-    def train(self, trusted_data, untrusted_data, save_path, *, batch_size: int = 64):
+    def train(
+        self,
+        trusted_data,
+        untrusted_data,
+        save_path,
+        *,
+        batch_size: int = 64,
+        num_workers: int = 0,
+    ):
         for data in [trusted_data, untrusted_data]:
             if data is None:
                 continue
             dataloader = torch.utils.data.DataLoader(
-                data, batch_size=batch_size, shuffle=False
+                data, batch_size=batch_size, shuffle=False, num_workers=num_workers
             )
             for batch in tqdm.tqdm(dataloader):
                 self.get_activations(batch)
@@ -235,6 +243,7 @@ class CacheBuilder(ActivationBasedDetector):
         self,
         dataset: MixedData,
         batch_size: int = 64,
+        num_workers: int = 0,
         **kwargs,
     ):
         # Check this explicitly because otherwise things can break in weird ways
@@ -245,6 +254,7 @@ class CacheBuilder(ActivationBasedDetector):
             dataset,
             batch_size=batch_size,
             shuffle=False,
+            num_workers=num_workers,
         )
         for batch in tqdm.tqdm(dataloader):
             # Remove anomaly labels
@@ -16,6 +16,12 @@ from cupbearer import utils
 from cupbearer.data import MixedData
 
 
+def _concatenate(batches: list[torch.Tensor] | list[np.ndarray]) -> np.ndarray:
+    if isinstance(batches[0], torch.Tensor):
+        return torch.cat(batches).cpu().numpy()  # type: ignore
+    return np.concatenate(batches)
+
+
 class AnomalyDetector(ABC):
     def __init__(self, layer_aggregation: str = "mean"):
         # For storing the original detector variables when finetuning
@@ -97,6 +103,7 @@ class AnomalyDetector(ABC):
         pbar: bool = False,
         layerwise: bool = False,
         log_yaxis: bool = True,
+        num_workers: int = 0,
     ):
         # Check this explicitly because otherwise things can break in weird ways
         # when we assume that anomaly labels are included.
@@ -109,6 +116,9 @@ class AnomalyDetector(ABC):
             # normal/anomalous data is distributed into batches. In that case, we want
             # to mix them by default.
             shuffle=True,
+            # Lets us copy batches to the GPU asynchronously, see utils.inputs_to_device
+            pin_memory=torch.cuda.is_available(),
+            num_workers=num_workers,
         )
 
         metrics = defaultdict(dict)
@@ -130,12 +140,12 @@ class AnomalyDetector(ABC):
                 else:
                     new_scores = {"all": self.scores(inputs)}
                 for layer, score in new_scores.items():
-                    if isinstance(score, torch.Tensor):
-                        score = score.cpu().numpy()
+                    # We leave scores on the device until the end, moving them to the
+                    # CPU here would make us wait for the model after every batch.
                     assert score.shape == new_labels.shape
                     scores[layer].append(score)
                     labels[layer].append(new_labels)
-        scores = {layer: np.concatenate(scores[layer]) for layer in scores}
+        scores = {layer: _concatenate(scores[layer]) for layer in scores}
         labels = {layer: np.concatenate(labels[layer]) for layer in labels}
 
         figs = {}
@@ -28,6 +28,7 @@ class FinetuningAnomalyDetector(AnomalyDetector):
         num_classes: int,
         lr: float = 1e-3,
         batch_size: int = 64,
+        num_workers: int = 0,
         **trainer_kwargs,
     ):
         if trusted_data is None:
@@ -40,7 +41,12 @@ class FinetuningAnomalyDetector(AnomalyDetector):
         )
 
         # Create a DataLoader for the clean dataset
-        clean_loader = DataLoader(trusted_data, batch_size=batch_size, shuffle=True)
+        clean_loader = DataLoader(
+            trusted_data,
+            batch_size=batch_size,
+            shuffle=True,
+            num_workers=num_workers,
+        )
 
         # Finetune the model on the clean dataset
         trainer = L.Trainer(default_root_dir=save_path, **trainer_kwargs)
@@ -29,6 +29,7 @@ class StatisticalDetector(ActivationBasedDetector, ABC):
         batch_size: int = 1024,
         pbar: bool = True,
         max_steps: int | None = None,
+        num_workers: int = 0,
         **kwargs,
     ):
         # Common for statistical methods is that the training does not require
@@ -48,16 +49,13 @@ class StatisticalDetector(ActivationBasedDetector, ABC):
                 data = untrusted_data
 
             # No reason to shuffle, we're just computing statistics
-            data_loader = DataLoader(data, batch_size=batch_size, shuffle=False)
-            example_batch = next(iter(data_loader))
-            example_activations = self.get_activations(example_batch)
-
-            # v is an entire batch, v[0] are activations for a single input
-            activation_sizes = {k: v[0].size() for k, v in example_activations.items()}
-            self.init_variables(
-                activation_sizes, device=next(iter(example_activations.values())).device
+            data_loader = DataLoader(
+                data,
+                batch_size=batch_size,
+                shuffle=False,
+                pin_memory=torch.cuda.is_available(),
+                num_workers=num_workers,
             )
-
             if pbar:
                 data_loader = tqdm(data_loader, total=max_steps or len(data_loader))
 
@@ -65,6 +63,16 @@ class StatisticalDetector(ActivationBasedDetector, ABC):
                 if max_steps and i >= max_steps:
                     break
                 activations = self.get_activations(batch)
+                if i == 0:
+                    # We need activation sizes to initialize the variables, but we use
+                    # the first batch for that rather than running the model on it
+                    # an extra time.
+                    # v is an entire batch, v[0] are activations for a single input
+                    activation_sizes = {k: v[0].size() for k, v in activations.items()}
+                    self.init_variables(
+                        activation_sizes,
+                        device=next(iter(activations.values())).device,
+                    )
                 self.batch_update(activations)
 
 
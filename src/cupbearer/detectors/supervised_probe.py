@@ -17,6 +17,7 @@ class SupervisedLinearProbe(ActivationBasedDetector):
         save_path: Path | str,
         *,
         batch_size: int = 64,
+        num_workers: int = 0,
         **sklearn_kwargs,
     ):
         if untrusted_data is None:
@@ -29,7 +30,12 @@ class SupervisedLinearProbe(ActivationBasedDetector):
                 "with access to anomaly labels."
             )
 
-        dataloader = DataLoader(untrusted_data, batch_size=batch_size, shuffle=True)
+        dataloader = DataLoader(
+            untrusted_data,
+            batch_size=batch_size,
+            shuffle=True,
+            num_workers=num_workers,
+        )
 
         activations = []
         anomaly_labels = []
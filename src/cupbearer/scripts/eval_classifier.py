@@ -15,6 +15,7 @@ def main(
     path: Path | str,
     max_batches: Optional[int] = None,
     batch_size: int = 2048,
+    num_workers: int = 0,
 ):
     path = Path(path)
 
@@ -22,6 +23,7 @@ def main(
         data,
         batch_size=batch_size,
         shuffle=False,
+        num_workers=num_workers,
     )
 
     classifier = Classifier.load_from_checkpoint(
@@ -11,6 +11,7 @@ def main(
     pbar: bool = False,
     batch_size: int = 1024,
     layerwise: bool = False,
+    num_workers: int = 0,
 ):
     detector.set_model(task.model)
 
@@ -20,4 +21,5 @@ def main(
         save_path=save_path,
         batch_size=batch_size,
         layerwise=layerwise,
+        num_workers=num_workers,
     )
@@ -11,6 +11,7 @@ def main(
     detector: AnomalyDetector,
     save_path: Path | str | None,
     eval_batch_size: int = 1024,
+    num_workers: int = 0,
     **train_kwargs,
 ):
     detector.set_model(task.model)
@@ -19,6 +20,7 @@ def main(
         trusted_data=task.trusted_data,
         untrusted_data=task.untrusted_train_data,
         save_path=save_path,
+        num_workers=num_workers,
         **train_kwargs,
     )
     if save_path:
@@ -30,4 +32,5 @@ def main(
         pbar=True,
         batch_size=eval_batch_size,
         save_path=save_path,
+        num_workers=num_workers,
     )
@@ -86,7 +86,12 @@ def save(data, path: Union[str, Path], overwrite: bool = False):
     torch.save(data, path.with_suffix(SUFFIX))
 
 
-def load(path: Union[str, Path]):
+def load(path: Union[str, Path], mmap: bool = False):
+    """Load data stored with `save`.
+
+    If `mmap` is True, tensors are memory-mapped from the file instead of being
+    read into memory, so only the parts that are actually accessed get loaded.
+    """
     path = Path(path)
     if path.is_dir():
         raise ValueError(
@@ -96,10 +101,14 @@ def load(path: Union[str, Path]):
 
     if path.suffix != SUFFIX:
         path = path.with_suffix(SUFFIX)
-    with open(path, "rb") as file:
-        data = torch.load(file)
-        data = tree_map(from_string, data)
-        return data
+    if mmap:
+        # Memory-mapping needs a path rather than a file object
+        data = torch.load(path, mmap=True)
+    else:
+        with open(path, "rb") as file:
+            data = torch.load(file)
+    data = tree_map(from_string, data)
+    return data
 
 
 def get_object(path: str):
@@ -134,7 +143,9 @@ def log_path(base="logs", time=True):
 
 def _try_to_device(x, device):
     if isinstance(x, torch.Tensor):
-        return x.to(device)
+        # Copies from pinned memory (e.g. from a DataLoader with pin_memory=True) can
+        # be asynchronous. For anything else, we keep the default blocking copy.
+        return x.to(device, non_blocking=x.is_pinned())
     return x
 
 
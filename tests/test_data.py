@@ -5,8 +5,9 @@ from dataclasses import dataclass
 import numpy as np
 import pytest
 import torch
-from cupbearer import data
-from torch.utils.data import DataLoader, Dataset
+import torchattacks
+from cupbearer import data, utils
+from torch.utils.data import DataLoader, Dataset, TensorDataset
 from torchvision.transforms import Normalize
 from torchvision.transforms.functional import InterpolationMode
 
@@ -147,6 +148,35 @@ class TestBackdoors(DatasetFixtures):
                 1.0 / np.sqrt(np.prod(clean_img.shape))
             )
 
+    @staticmethod
+    @pytest.mark.parametrize(
+        "batch_backdoor_type",
+        [data.backdoors.CornerPixelBackdoor, data.backdoors.NoiseBackdoor],
+    )
+    def test_batched_backdoor(clean_image_dataset, batch_backdoor_type):
+        target_class = 1
+        for p_backdoor in [0.0, 1.0]:
+            data_loader = DataLoader(
+                dataset=clean_image_dataset,
+                batch_size=3,
+                collate_fn=data.TransformCollate(
+                    batch_backdoor_type(
+                        p_backdoor=p_backdoor, target_class=target_class
+                    )
+                ),
+            )
+            for img, label in data_loader:
+                assert img.shape == (3, *clean_image_dataset.img.shape)
+                assert torch.min(img) >= 0
+                assert torch.max(img) <= 1
+                if p_backdoor == 1.0:
+                    assert torch.all(label == target_class)
+                    assert torch.all(
+                        torch.any((img != clean_image_dataset.img).flatten(1), dim=1)
+                    )
+                else:
+                    assert torch.all(img == clean_image_dataset.img)
+
     @staticmethod
     def test_wanet_backdoor(clean_image_dataset):
         # Pick a target class outside the actual range so we can later tell whether it
@@ -353,3 +383,96 @@ class TestAugmentations(DatasetFixtures):
         dataset = DummyPytorchDataset(default_augmentations=False)
         for trafo in dataset.transforms:
             assert not isinstance(trafo, data.transforms.ProbabilisticTransform)
+
+
+@pytest.mark.slow
+def test_preloaded_mnist():
+    preloaded = data.MNIST(train=False)
+    original = data.MNIST(train=False, preload=False)
+    assert isinstance(preloaded._dataset, data.PreloadedMNIST)
+    assert len(preloaded) == len(original)
+    for i in range(10):
+        img, label = preloaded[i]
+        original_img, original_label = original[i]
+        assert label == original_label
+        assert img.shape == (1, 28, 28)
+        torch.testing.assert_close(img, original_img)
+
+
+@pytest.mark.parametrize("dtype", [torch.float32, torch.uint8])
+def test_adversarial_examples_from_file(tmp_path, dtype: torch.dtype):
+    if dtype == torch.uint8:
+        # Stored as 8-bit images, like make_adversarial_examples does
+        adv_inputs = torch.randint(0, 256, (5, 1, 4, 4), dtype=torch.uint8)
+        expected = adv_inputs.float() / 255
+    else:
+        adv_inputs = expected = torch.rand(5, 1, 4, 4)
+    labels = torch.arange(5)
+    utils.save({"adv_inputs": adv_inputs, "labels": labels}, tmp_path / "advexes")
+
+    dataset = data.AdversarialExampleDataset.from_file(
+        tmp_path / "advexes", num_examples=3
+    )
+    assert len(dataset) == 3
+    for i, (img, label) in enumerate(dataset):
+        assert img.dtype == torch.float32
+        torch.testing.assert_close(img, expected[i])
+        assert label == i
+        # Modifying the returned example mustn't change the stored one
+        img.zero_()
+        torch.testing.assert_close(dataset[i][0], expected[i])
+
+    with pytest.raises(ValueError):
+        data.AdversarialExampleDataset.from_file(tmp_path / "advexes", num_examples=6)
+
+
+def test_quantize_stays_in_eps_ball():
+    eps = 8 / 255
+    # Clean inputs that aren't on the 1/255 grid, like after resizing
+    inputs = torch.rand(100, 3, 4, 4)
+    adv_inputs = (inputs + eps * torch.randn_like(inputs).sign()).clamp(0, 1)
+    quantized = data.adversarial._quantize(adv_inputs.clone(), inputs, eps)
+    assert quantized.dtype == torch.uint8
+    dequantized = quantized.float() / 255
+    assert torch.all((dequantized - inputs).abs() <= eps + 1e-6)
+
+
+@pytest.mark.parametrize("preload_to_device", [False, True])
+def test_make_adversarial_examples(tmp_path, preload_to_device: bool):
+    num_examples, num_classes = 10, 3
+    inputs = torch.rand(num_examples, 3, 8, 12)
+    labels = torch.arange(num_examples) % num_classes
+    model = torch.nn.Sequential(
+        torch.nn.Flatten(), torch.nn.Linear(3 * 8 * 12, num_classes)
+    )
+    eps = 8 / 255
+
+    dataset = data.make_adversarial_examples(
+        model,
+        TensorDataset(inputs, labels),
+        tmp_path / "advexes",
+        # Use a smaller last batch to also test that case
+        batch_size=4,
+        eps=eps,
+        # We only care about the mechanics here, not whether the attack succeeds
+        success_threshold=1.0,
+        steps=1,
+        preload_to_device=preload_to_device,
+    )
+    # Both the DataLoader and the preloading path should produce examples in the
+    # original order, so we compare both against the same reference.
+    assert (tmp_path / "advexes.pt").exists()
+    assert dataset.advexes.shape == inputs.shape
+    assert dataset.advexes.dtype == torch.uint8
+    assert torch.all(dataset.labels == labels)
+    assert torch.all((dataset.advexes.float() / 255 - inputs).abs() <= eps + 1e-6)
+
+    adv_inputs, adv_labels, rob_acc = data.adversarial._attack(
+        torchattacks.PGD(model, eps=eps, alpha=2 / 255, steps=1),
+        zip(inputs.split(4), labels.split(4)),
+        num_examples=num_examples,
+    )
+    assert adv_inputs.shape == inputs.shape
+    assert adv_inputs.dtype == torch.uint8
+    assert torch.all(adv_labels == labels)
+    assert 0 <= rob_acc <= 100
@@ -2,6 +2,7 @@ import math
 
 import pytest
 import torch
+from cupbearer import utils
 from cupbearer.detectors.statistical.helpers import batch_covariance
 
 
@@ -72,3 +73,14 @@ def test_spectral_computation(N: int):
     except AssertionError:
         # Sign ambiguity
         assert torch.allclose(-v_direct, v_indirect)
+
+
+@pytest.mark.parametrize("mmap", [False, True])
+def test_save_load(tmp_path, mmap: bool):
+    original = {"tensor": torch.randn(3, 4), "number": 5, "path": tmp_path}
+    utils.save(original, tmp_path / "data")
+    loaded = utils.load(tmp_path / "data", mmap=mmap)
+    torch.testing.assert_close(loaded["tensor"], original["tensor"])
+    assert loaded["number"] == 5
+    # Paths are stored as strings
+    assert loaded["path"] == str(tmp_path)